@@ -1,46 +1,137 @@
+import logging
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
 from dotenv import load_dotenv
 
-# Always load the .env that sits next to this file (backend/.env)
+try:
+    # Written at deploy time by backend/scripts/compile_env.py
+    from backend._env_compiled import ENV_VALUES as _COMPILED_ENV
+except ImportError:
+    _COMPILED_ENV = None
+
+logger = logging.getLogger(__name__)
+
+# Local development reads the .env that sits next to this file (backend/.env)
 ENV_PATH = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=ENV_PATH, override=True) # override=True (If a variable already exists, replace it
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash")
-ENV = os.getenv("ENV", "development") # what environment we're running in (development, production, etc.)
-LOG_LEVEL = os.getenv("LOG_LEVEL", "info") # how noisy the logs should be (debug, info, warning, error, critical)
+# Environments that still read backend/.env; production gets its vars from the process env
+_DOTENV_ENVS = (None, "development", "test")
 
-# Groq fallback LLM
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
-GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 
-RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
-RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST")
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
 
-ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY", "")
-ELEVEN_STT_MODEL_ID = os.getenv("ELEVEN_STT_MODEL_ID", "scribe_v2_realtime")
-ELEVEN_STT_SAMPLE_RATE = int(os.getenv("ELEVEN_STT_SAMPLE_RATE", "16000"))
 
-# ElevenLabs TTS Configuration
-ELEVEN_TTS_VOICE_ID = os.getenv("ELEVEN_TTS_VOICE_ID", "EXAVITQu4vr4xnSDxMaL")  # Sarah (premade) — free-tier compatible
-ELEVEN_TTS_MODEL_ID = os.getenv("ELEVEN_TTS_MODEL_ID", "eleven_multilingual_v2")
-ELEVEN_TTS_STABILITY = float(os.getenv("ELEVEN_TTS_STABILITY", "0.5"))
-ELEVEN_TTS_SIMILARITY_BOOST = float(os.getenv("ELEVEN_TTS_SIMILARITY_BOOST", "0.75"))
-ELEVEN_TTS_OPTIMIZE_LATENCY = int(os.getenv("ELEVEN_TTS_OPTIMIZE_LATENCY", "4"))
+@dataclass(frozen=True)
+class Settings:
+    gemini_api_key: Optional[str]
+    gemini_model: str
+    env: str        # what environment we're running in (development, production, etc.)
+    log_level: str  # how noisy the logs should be (debug, info, warning, error, critical)
 
+    # Groq fallback LLM
+    groq_api_key: str
+    groq_model: str
 
-REDIS_ENABLED = os.getenv("REDIS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-REDIS_SESSION_TTL_SECONDS = int(os.getenv("REDIS_SESSION_TTL_SECONDS", "1800"))
-REDIS_MAX_TURNS = int(os.getenv("REDIS_MAX_TURNS", "8"))
+    rapidapi_key: Optional[str]
+    rapidapi_host: Optional[str]
 
-DAILY_API_KEY = os.getenv("DAILY_API_KEY", "")
-DAILY_BOT_URL = os.getenv("DAILY_BOT_URL", "http://localhost:8100")
+    eleven_api_key: str
+    eleven_stt_model_id: str
+    eleven_stt_sample_rate: int
 
+    # ElevenLabs TTS Configuration
+    eleven_tts_voice_id: str
+    eleven_tts_model_id: str
+    eleven_tts_stability: float
+    eleven_tts_similarity_boost: float
+    eleven_tts_optimize_latency: int
+
+    redis_enabled: bool
+    redis_url: str
+    redis_session_ttl_seconds: int
+    redis_max_turns: int
+
+    daily_api_key: str
+    daily_bot_url: str
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Read backend/.env (development/test) or the compiled env (deployed) and the process env exactly once per process."""
+    if os.environ.get("ENV") in _DOTENV_ENVS:
+        # Local runs always read the live .env, even if a stale _env_compiled.py is lying around
+        if ENV_PATH.exists():
+            load_dotenv(dotenv_path=ENV_PATH, override=False) # override=False (variables already set in the process env win)
+            logger.debug("Settings loaded from %s", ENV_PATH)
+    elif _COMPILED_ENV is not None:
+        for key, value in _COMPILED_ENV.items():
+            os.environ.setdefault(key, value) # same precedence as override=False
+        logger.debug("Settings loaded from backend/_env_compiled.py")
+
+    return Settings(
+        gemini_api_key=os.getenv("GEMINI_API_KEY"),
+        gemini_model=os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash"),
+        env=os.getenv("ENV", "development"),
+        log_level=os.getenv("LOG_LEVEL", "info"),
+        groq_api_key=os.getenv("GROQ_API_KEY", ""),
+        groq_model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
+        rapidapi_key=os.getenv("RAPIDAPI_KEY"),
+        rapidapi_host=os.getenv("RAPIDAPI_HOST"),
+        eleven_api_key=os.getenv("ELEVEN_API_KEY", ""),
+        eleven_stt_model_id=os.getenv("ELEVEN_STT_MODEL_ID", "scribe_v2_realtime"),
+        eleven_stt_sample_rate=int(os.getenv("ELEVEN_STT_SAMPLE_RATE", "16000")),
+        eleven_tts_voice_id=os.getenv("ELEVEN_TTS_VOICE_ID", "EXAVITQu4vr4xnSDxMaL"),  # Sarah (premade) — free-tier compatible
+        eleven_tts_model_id=os.getenv("ELEVEN_TTS_MODEL_ID", "eleven_multilingual_v2"),
+        eleven_tts_stability=float(os.getenv("ELEVEN_TTS_STABILITY", "0.5")),
+        eleven_tts_similarity_boost=float(os.getenv("ELEVEN_TTS_SIMILARITY_BOOST", "0.75")),
+        eleven_tts_optimize_latency=int(os.getenv("ELEVEN_TTS_OPTIMIZE_LATENCY", "4")),
+        redis_enabled=_env_bool("REDIS_ENABLED", "true"),
+        redis_url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        redis_session_ttl_seconds=int(os.getenv("REDIS_SESSION_TTL_SECONDS", "1800")),
+        redis_max_turns=int(os.getenv("REDIS_MAX_TURNS", "8")),
+        daily_api_key=os.getenv("DAILY_API_KEY", ""),
+        daily_bot_url=os.getenv("DAILY_BOT_URL", "http://localhost:8100"),
+    )
 
-if not RAPIDAPI_KEY or not RAPIDAPI_HOST:
-    raise RuntimeError(f"RapidAPI creds missing. Loaded from: {ENV_PATH}")
 
+settings = get_settings()
 
+# Module-level names kept so existing `from backend.config import X` imports keep working
+GEMINI_API_KEY = settings.gemini_api_key
+GEMINI_MODEL = settings.gemini_model
+ENV = settings.env
+LOG_LEVEL = settings.log_level
 
+GROQ_API_KEY = settings.groq_api_key
+GROQ_MODEL = settings.groq_model
+
+RAPIDAPI_KEY = settings.rapidapi_key
+RAPIDAPI_HOST = settings.rapidapi_host
+
+ELEVEN_API_KEY = settings.eleven_api_key
+ELEVEN_STT_MODEL_ID = settings.eleven_stt_model_id
+ELEVEN_STT_SAMPLE_RATE = settings.eleven_stt_sample_rate
+
+ELEVEN_TTS_VOICE_ID = settings.eleven_tts_voice_id
+ELEVEN_TTS_MODEL_ID = settings.eleven_tts_model_id
+ELEVEN_TTS_STABILITY = settings.eleven_tts_stability
+ELEVEN_TTS_SIMILARITY_BOOST = settings.eleven_tts_similarity_boost
+ELEVEN_TTS_OPTIMIZE_LATENCY = settings.eleven_tts_optimize_latency
+
+
+REDIS_ENABLED = settings.redis_enabled
+REDIS_URL = settings.redis_url
+REDIS_SESSION_TTL_SECONDS = settings.redis_session_ttl_seconds
+REDIS_MAX_TURNS = settings.redis_max_turns
+
+DAILY_API_KEY = settings.daily_api_key
+DAILY_BOT_URL = settings.daily_bot_url
+
+
+if not RAPIDAPI_KEY or not RAPIDAPI_HOST:
+    raise RuntimeError(f"RapidAPI creds missing. Loaded from: {ENV_PATH}")
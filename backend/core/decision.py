@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import re
-from dataclasses import asdict
-from datetime import date, datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, replace
+from datetime import date, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
-from backend.ml.query_router import predict_intent
+try:
+    import orjson  # optional: Rust-backed JSON, several times faster than the stdlib for prompt I/O
+except ImportError:
+    orjson = None
+
+from backend.ml.query_router_batcher import batched_predict_intent
 from backend.services.keyword_extractor import extract_slots, Slots
 
 from backend.services.hotel_insights_localdb import get_hotel_insights_localdb
 from backend.services.hotel_insights_rapidapi import get_hotel_insights
 
 from backend.services.location_geoid_converter import convert_geo_id, CITY_GEOIDS, fuzzy_match_city
-from backend.models import generate_text
+from backend.models import agenerate_text
 
 
 logger = logging.getLogger(__name__)
@@ -33,44 +42,79 @@ HOTEL_WORDS = (
     "motel", "inn", "bnb", "b&b", "airbnb",
 )
 
-BOOKING_WORDS = (
-    "price", "prices", "cost", "rates", "how much",
-    "availability", "available", "book", "booking", "reserve",
-    "check-in", "check out", "check-out",
-    "tonight", "tomorrow", "weekend", "next week", "next month",
+# Booking signals as one pattern: word stems with explicit inflections instead of a word list
+_BOOKING_PATTERN = (
+    r"\b(?:prices?|rates?|costs?|how much|book(?:s|ed|ing|ings)?|reserv(?:e|ed|ation|ations)"
+    r"|availab(?:le|ility)|vacanc(?:y|ies)|tonight|tomorrow|weekends?|next (?:week|month)"
+    r"|check[\s-]?(?:in|out)|for \d+ nights?)\b"
+)
+_BOOKING_RE = re.compile(_BOOKING_PATTERN, re.IGNORECASE)
+
+# Verb stems keep the inflections the old substring scan caught ("where I'm staying", "lodging")
+_HOTEL_WORD_FORMS = {"stay": r"stay(?:s|ed|ing)?", "lodge": r"lodg(?:es?|ed|ing)"}
+# Hotel words as one alternation, longest first; optional plural "s", bounded like [a-z&-] word tokens
+_HOTEL_PATTERN = (
+    r"(?<![a-z&\-])(?:"
+    + "|".join(
+        _HOTEL_WORD_FORMS.get(w, re.escape(w) + "s?") for w in sorted(HOTEL_WORDS, key=len, reverse=True)
+    )
+    + r")(?![a-z&\-])"
 )
 
 # ── Regex patterns ──
-_DATE_SIGNAL_RE = re.compile(
-    r"(\b\d{4}-\d{2}-\d{2}\b|\bcheck[\s-]?in\b|\bcheck[\s-]?out\b|\btonight\b|\btomorrow\b|\bnext week\b|\bnext month\b|\bthis weekend\b)",
-    re.IGNORECASE,
-)
+# Atomic groups (?>...) stop the word/day runs from being re-split on a failed match;
+# month words are bounded to 3-9 letters ("may" .. "september"), longer words can't be months anyway
 _NATURAL_DATE_RANGE_RE = re.compile(
-    r"\b(?:from\s+)?([a-zA-Z]+\s+\d{1,2}(?:st|nd|rd|th)?(?:\s+\d{4})?)\s+(?:to|until|till|\-)\s+([a-zA-Z]+\s+\d{1,2}(?:st|nd|rd|th)?(?:\s+\d{4})?)\b",
+    r"\b(?:from\s+)?((?>[a-zA-Z]{3,9})\s+(?>\d{1,2})(?:st|nd|rd|th)?(?:\s+\d{4})?)\s+(?:to|until|till|\-)\s+((?>[a-zA-Z]{3,9})\s+(?>\d{1,2})(?:st|nd|rd|th)?(?:\s+\d{4})?)\b",
     re.IGNORECASE,
 )
+# The check-in token is bounded: a lazy unbounded run re-scans the rest of the text for every "check in"
 _CHECKIN_CHECKOUT_RE = re.compile(
-    r"check[\s-]?in\s+(.+?)\s+check[\s-]?out\s+(.+)", re.IGNORECASE,
+    r"check[\s-]?in\s+([^\n]{1,40}?)\s+check[\s-]?out\s+(.+)", re.IGNORECASE,
 )
-_FAST_BETWEEN_PRICE_RE = re.compile(r"\bbetween\s+([\d.,]+k?)\s+(?:and|to)\s+([\d.,]+k?)\b", re.IGNORECASE)
-_FAST_UNDER_PRICE_RE = re.compile(r"\b(?:under|below|less than|up to)\s+([\d.,]+k?)\b", re.IGNORECASE)
-_FAST_OVER_PRICE_RE = re.compile(r"\b(?:over|above|more than|at least)\s+([\d.,]+k?)\b(?!\s*star)", re.IGNORECASE)
+# Adults / rooms / price filters in one scan; m.lastgroup names the filter that matched.
+# Amounts followed by a count noun ("at least 2 rooms", "under 4 star") are not prices.
+_NOT_PRICE = r"\b(?!\s*(?:adults?|people|persons|guests|rooms?|stars?))"
+_FAST_FILTERS_RE = re.compile(
+    r"(?P<adults>(?P<adults_n>\d+)\s*(?:adults?|people|persons|guests))"
+    r"|(?P<rooms>(?P<rooms_n>\d+)\s*rooms?)"
+    r"|(?P<between>\bbetween\s+(?P<lo>[\d.,]+k?)" + _NOT_PRICE + r"\s+(?:and|to)\s+(?P<hi>[\d.,]+k?)" + _NOT_PRICE + r")"
+    r"|(?P<under>\b(?:under|below|less than|up to)\s+(?P<max>[\d.,]+k?)" + _NOT_PRICE + r")"
+    r"|(?P<over>\b(?:over|above|more than|at least)\s+(?P<min>[\d.,]+k?)" + _NOT_PRICE + r")",
+    re.IGNORECASE,
+)
+# Shorthand date words → (days from today to check-in, nights); None offset means "next Saturday"
+_SHORTHAND_DATES: Dict[str, Tuple[Optional[int], int]] = {
+    "tonight": (0, 1),
+    "tomorrow": (1, 1),
+    "weekend": (None, 2),
+    "next week": (7, 2),
+    "next month": (30, 2),
+}
+# Zero-width lookahead so findall reports overlapping hits: "next weekend" yields both "weekend" and "next week"
+# (the same as the old per-word `in` checks), and table order then picks "weekend"
+_SHORTHAND_RE = re.compile("(?=(" + "|".join(_SHORTHAND_DATES) + "))")
+# Every date form we parse needs a digit (ISO, "March 20") or a shorthand word; without one, skip parsing
+_DATE_SIGNAL_RE = re.compile(r"\d|" + "|".join(_SHORTHAND_DATES), re.IGNORECASE)
+_MONEY_AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k)?", re.IGNORECASE)
+_DIGIT_RE = re.compile(r"\d")
 _ISO_DATE_RE = re.compile(r"\b(20\d{2}-\d{2}-\d{2})\b")
-_ADULTS_RE = re.compile(r"(\d+)\s*(adults|adult|people|persons|guests)", re.IGNORECASE)
-_ROOMS_RE = re.compile(r"(\d+)\s*(rooms|room)", re.IGNORECASE)
 _FILTER_HINT_RE = re.compile(
     r"\b(under|below|less than|up to|above|over|more than|at least|between|budget|cheap|affordable|rating|star|luxury)\b",
     re.IGNORECASE,
 )
 
+# Body of a markdown code fence (```json ... ```) in an LLM reply; tolerates prose around it and a missing close
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|\Z)", re.DOTALL | re.IGNORECASE)
+
 # ── Off-topic patterns ──
-_GREETING_RE = re.compile(
-    r"^\s*(hi|hello|hey|good\s*(morning|afternoon|evening)|greetings|yo|sup|howdy)\s*[!?.]*\s*$",
-    re.IGNORECASE,
-)
-_FAREWELL_RE = re.compile(
-    r"^\s*(bye|goodbye|see\s*you|take\s*care|thanks|thank\s*you|cheers|ciao)\s*[!?.]*\s*$",
-    re.IGNORECASE,
+_GREETING_WORDS = r"hi|hello|hey|good\s*(?:morning|afternoon|evening)|greetings|yo|sup|howdy"
+_FAREWELL_WORDS = r"bye|goodbye|see\s*you|take\s*care|thanks|thank\s*you|cheers|ciao"
+_GREETING_RE = re.compile(rf"^\s*(?:{_GREETING_WORDS})\s*[!?.]*\s*$", re.IGNORECASE)
+_FAREWELL_RE = re.compile(rf"^\s*(?:{_FAREWELL_WORDS})\s*[!?.]*\s*$", re.IGNORECASE)
+# Whole-message greeting or farewell in one anchored match (the common off-topic turn)
+_TRIVIAL_OFF_TOPIC_RE = re.compile(
+    rf"^\s*(?:{_GREETING_WORDS}|{_FAREWELL_WORDS})\s*[!?.]*\s*$", re.IGNORECASE,
 )
 _NON_HOTEL_QUESTION_RE = re.compile(
     r"\b(weather|restaurant|food|eat|flight|train|bus|taxi|museum|temple|church|attraction|visa|currency|recipe|joke|movie|news|sport)\b",
@@ -81,36 +125,90 @@ _META_QUESTION_RE = re.compile(
     re.IGNORECASE,
 )
 
+# All known cities as one alternation (longest first so multi-word names win over prefixes)
+_CITY_BY_LOWER = {city.lower(): city for city in CITY_GEOIDS}
+_CITY_ALT_RE = re.compile(
+    r"\b(" + "|".join(re.escape(c) for c in sorted(_CITY_BY_LOWER, key=len, reverse=True)) + r")\b"
+)
+_CITY_CHOICES = tuple(CITY_GEOIDS)  # ASK_LOCATION choices; immutable, so every response can share it
+
+# Hotel / booking / city signals in one pass; m.lastgroup names the category that fired
+_KEYWORD_SCAN_RE = re.compile(
+    rf"(?P<hotel>{_HOTEL_PATTERN})|(?P<booking>{_BOOKING_PATTERN})|(?P<city>{_CITY_ALT_RE.pattern})",
+    re.IGNORECASE,
+)
+
 _MONTH_NAMES = {
     "january", "february", "march", "april", "may", "june",
     "july", "august", "september", "october", "november", "december",
     "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "oct", "nov", "dec",
 }
 
+# Full names and 3-letter abbreviations → month number (replaces the strptime %B/%b formats)
+_MONTH_TO_NUM = {
+    name: num
+    for num, full in enumerate(
+        ("january", "february", "march", "april", "may", "june",
+         "july", "august", "september", "october", "november", "december"),
+        start=1,
+    )
+    for name in (full, full[:3])
+}
+
+# "20th March [2026]" or "March 20 [2026]"; the whole token must match
+_NATURAL_DATE_RE = re.compile(
+    r"(?:(?P<day1>\d{1,2})(?:st|nd|rd|th)?\s+(?P<mon1>[a-z]+)"
+    r"|(?P<mon2>[a-z]+)\s+(?P<day2>\d{1,2})(?:st|nd|rd|th)?)"
+    r"(?:\s+(?P<year>\d{4}))?",
+    re.IGNORECASE,
+)
+
+
+_SLOT_FIELDS = tuple(f.name for f in fields(Slots))
+
 
 # ═══════════════════════════════════════════════
 #  Helper functions
 # ═══════════════════════════════════════════════
 
-def _contains_any(text: str, keywords: Tuple[str, ...]) -> bool:
-    """Check if any keyword appears in text."""
-    t = (text or "").lower()
-    return any(k in t for k in keywords)
+@lru_cache(maxsize=1024)
+def _scan_keywords(lowered: str) -> frozenset:
+    """Keyword categories ("hotel", "booking", "city") present in a lowercased query, from one scan.
+    Cached because _apply_overrides runs twice per turn on the same query."""
+    return frozenset(m.lastgroup for m in _KEYWORD_SCAN_RE.finditer(lowered))
+
+
+@lru_cache(maxsize=4096)
+def _cached_extract_slots(query_key: str, today_ordinal: int) -> Slots:
+    # today_ordinal is only part of the key: relative dates ("tomorrow") must not outlive the day
+    return extract_slots(query_key)
+
+
+def _extract_slots(query: str, today: Optional[date] = None) -> Slots:
+    """Memoized extract_slots (Slots is frozen, so cached instances are shared safely)."""
+    return _cached_extract_slots((query or "").strip(), (today or date.today()).toordinal())
+
+
+# One worker: the shared spaCy pipeline and dateparser's global state make no thread-safety
+# promises, so extractions run one at a time (as they did on the event loop), just off it
+_SLOT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slot-extract")
+
+
+async def _aextract_slots(query: str, today: Optional[date] = None) -> Slots:
+    """_extract_slots on the dedicated slot-extraction thread."""
+    return await asyncio.get_running_loop().run_in_executor(_SLOT_EXECUTOR, _extract_slots, query, today)
 
 
-def _is_off_topic(query: str) -> bool:
-    """Return True if the query is clearly not about hotels."""
-    q = (query or "").strip()
+def _is_off_topic(query: str, lowered: Optional[str] = None) -> bool:
+    """Return True if the query is clearly not about hotels. Pass `lowered` if the caller already lowercased it."""
+    q = (lowered if lowered is not None else (query or "").lower()).strip()
     if not q:
         return False
-    if _GREETING_RE.match(q) or _FAREWELL_RE.match(q) or _META_QUESTION_RE.search(q):
+    if _TRIVIAL_OFF_TOPIC_RE.match(q) or _META_QUESTION_RE.search(q):
         return True
 
-    has_hotel = _contains_any(q, HOTEL_WORDS)
-    has_booking = _contains_any(q, BOOKING_WORDS)
-    has_city = any(re.search(rf"\b{re.escape(c.lower())}\b", q.lower()) for c in CITY_GEOIDS)
-
-    if not has_hotel and not has_booking and not has_city and _NON_HOTEL_QUESTION_RE.search(q):
+    # Any hotel, booking or city signal keeps the query on-topic
+    if _KEYWORD_SCAN_RE.search(q) is None and _NON_HOTEL_QUESTION_RE.search(q):
         return True
     return False
 
@@ -119,8 +217,15 @@ def _money_to_int(value: str) -> Optional[int]:
     """Convert strings like '25k', '25000', '25,000' to int."""
     if not value:
         return None
-    cleaned = re.sub(r"(lkr|rs\.?|rupees?)\b", "", value.strip().lower().replace(",", ""))
-    match = re.search(r"(\d+(?:\.\d+)?)\s*(k)?", cleaned, re.IGNORECASE)
+    # Fast path: the filter regexes mostly hand over plain "25000" / "25k"
+    s = value.strip()
+    if s.isascii():
+        if s.isdigit():
+            return int(s)
+        if len(s) > 1 and s[-1] in "kK" and s[:-1].isdigit():
+            return int(s[:-1]) * 1000
+    # Currency words (lkr, rs., rupees) hold no digits, so the amount search can skip past them
+    match = _MONEY_AMOUNT_RE.search(s.replace(",", ""))
     if not match:
         return None
     amount = float(match.group(1))
@@ -129,24 +234,39 @@ def _money_to_int(value: str) -> Optional[int]:
     return int(amount)
 
 
+@lru_cache(maxsize=1024)
 def _parse_natural_date(token: str, today: date) -> Optional[date]:
-    """Try to parse a human-written date like 'March 20' or '20th March 2026'."""
-    cleaned = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", (token or "").strip(), flags=re.IGNORECASE)
-    for fmt in ("%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y", "%d %B", "%d %b", "%B %d", "%b %d"):
+    """Try to parse a human-written date like 'March 20' or '20th March 2026'.
+    Cached per (token, today): repeated queries reuse the same date tokens."""
+    m = _NATURAL_DATE_RE.fullmatch((token or "").strip())
+    if not m:
+        return None
+    day = m.group("day1") or m.group("day2")
+    month = _MONTH_TO_NUM.get((m.group("mon1") or m.group("mon2")).lower())
+    if month is None:
+        return None
+    try:
+        if m.group("year"):
+            return date(int(m.group("year")), month, int(day))
+        result = date(today.year, month, int(day))
+    except ValueError:
+        return None
+    if result < today - timedelta(days=30):
         try:
-            result = datetime.strptime(cleaned.strip(), fmt).date()
-            if "%Y" not in fmt:
-                result = result.replace(year=today.year)
-                if result < today - timedelta(days=30):
-                    result = result.replace(year=today.year + 1)
-            return result
+            result = result.replace(year=today.year + 1)
         except ValueError:
-            continue
-    return None
+            return None
+    return result
+
 
+def _infer_dates_from_text(
+    text: str, today: Optional[date] = None, lowered: Optional[str] = None
+) -> tuple[Optional[date], Optional[date]]:
+    """Extract check-in / check-out dates from free text, relative to `today` (defaults to date.today()).
+    Pass `lowered` if the caller already lowercased it."""
+    if not _DATE_SIGNAL_RE.search(text or ""):
+        return None, None
 
-def _infer_dates_from_text(text: str) -> tuple[Optional[date], Optional[date]]:
-    """Extract check-in / check-out dates from free text."""
     # Try ISO dates first (e.g. 2026-03-20)
     iso_dates = _ISO_DATE_RE.findall(text)
     if len(iso_dates) >= 2:
@@ -155,7 +275,7 @@ def _infer_dates_from_text(text: str) -> tuple[Optional[date], Optional[date]]:
         except ValueError:
             pass
 
-    today = date.today()
+    today = today or date.today()
 
     # "check in March 20 check out March 22"
     m = _CHECKIN_CHECKOUT_RE.search(text or "")
@@ -183,108 +303,122 @@ def _infer_dates_from_text(text: str) -> tuple[Optional[date], Optional[date]]:
                 second = second.replace(year=second.year + 1)
             return first, second
 
-    # Shorthand words
-    lowered = (text or "").lower()
-    if "tonight" in lowered:
-        return today, today + timedelta(days=1)
-    if "tomorrow" in lowered:
-        start = today + timedelta(days=1)
-        return start, start + timedelta(days=1)
-    if "weekend" in lowered:
-        days_until_sat = (5 - today.weekday()) % 7
-        start = today + timedelta(days=days_until_sat)
-        return start, start + timedelta(days=2)
-    if "next week" in lowered:
-        start = today + timedelta(days=7)
-        return start, start + timedelta(days=2)
-    if "next month" in lowered:
-        start = today + timedelta(days=30)
-        return start, start + timedelta(days=2)
+    # Shorthand words: one scan, then the first hit in table order wins
+    hits = set(_SHORTHAND_RE.findall(lowered if lowered is not None else (text or "").lower()))
+    if hits:
+        for word, (offset, nights) in _SHORTHAND_DATES.items():
+            if word in hits:
+                if offset is None:  # weekend → the coming Saturday
+                    offset = (5 - today.weekday()) % 7
+                start = today + timedelta(days=offset)
+                return start, start + timedelta(days=nights)
 
     return None, None
 
 
-def _apply_overrides(pred_intent: str, query: str, slots) -> str:
+def _apply_overrides(pred_intent: str, query_lower: str, slots) -> str:
     """
     Rule-based corrections on top of ML predictions.
     - If dates exist → LIVE_PRICES
     - If booking words but no dates → NEEDS_DATES
     - If hotel words → EXPLORE_LOCAL
+    Expects the already-lowercased query; cheap slot/label checks run before any keyword scan.
     """
     if pred_intent == OFF_TOPIC:
         return OFF_TOPIC
 
-    if getattr(slots, "check_in", None) and getattr(slots, "check_out", None):
+    if slots.check_in and slots.check_out:
         return LIVE_PRICES
 
-    if _contains_any(query, BOOKING_WORDS):
+    keywords = _scan_keywords(query_lower)
+    if "booking" in keywords:
         return NEEDS_DATES
 
-    if _contains_any(query, HOTEL_WORDS) and pred_intent not in (LIVE_PRICES, NEEDS_DATES):
+    if pred_intent not in (LIVE_PRICES, NEEDS_DATES) and "hotel" in keywords:
         return EXPLORE_LOCAL
 
     return pred_intent
 
 
-def _apply_context_slots(slots: Slots, context_slots: Dict[str, Any]) -> None:
-    """Fill in any missing slot values from conversation context."""
-    if not context_slots:
-        return
+def _parse_context_slots(context_slots: Dict[str, Any]) -> Slots:
+    """Validate slots remembered from earlier turns once into a typed Slots (bad values become None)."""
+    parsed: Dict[str, Any] = {"location": str(context_slots.get("location") or "").strip() or None}
 
-    if not slots.location and context_slots.get("location"):
-        slots.location = str(context_slots["location"])
-
-    if not slots.check_in and context_slots.get("check_in"):
-        try:
-            slots.check_in = date.fromisoformat(str(context_slots["check_in"]))
-        except ValueError:
-            pass
-    if not slots.check_out and context_slots.get("check_out"):
-        try:
-            slots.check_out = date.fromisoformat(str(context_slots["check_out"]))
-        except ValueError:
-            pass
+    for key in ("check_in", "check_out"):
+        if context_slots.get(key):
+            try:
+                parsed[key] = date.fromisoformat(str(context_slots[key]))
+            except ValueError:
+                pass
 
-    for field in ("adults", "rooms", "price_min", "price_max"):
-        if getattr(slots, field, None) is None and context_slots.get(field) is not None:
+    for key in ("adults", "rooms", "price_min", "price_max"):
+        if context_slots.get(key) is not None:
             try:
-                setattr(slots, field, int(context_slots[field]))
+                parsed[key] = int(context_slots[key])
             except (ValueError, TypeError):
                 pass
 
+    return Slots(**parsed)
+
+
+def _apply_context_slots(slots: Slots, context: Slots) -> Slots:
+    """Return slots with any missing values filled in from the parsed conversation context."""
+    updates = {
+        name: value
+        for name in _SLOT_FIELDS
+        if (value := getattr(context, name)) is not None and getattr(slots, name) in (None, "")
+    }
+    return replace(slots, **updates) if updates else slots
+
 
 # ═══════════════════════════════════════════════
 #  Fast regex-based intent + slot extraction
 # ═══════════════════════════════════════════════
 
-def _try_fast_intent_and_slots(query: str, fallback_location: Optional[str] = None) -> Tuple[str, float, Slots] | None:
+def _try_fast_intent_and_slots(
+    query: str,
+    fallback_location: Optional[str] = None,
+    lowered: Optional[str] = None,
+    today: Optional[date] = None,
+) -> Tuple[str, float, Slots] | None:
     """
     Try to determine intent and extract slots using regex alone (no ML).
     Returns None if we can't confidently determine the intent.
+    Memoized on the stripped query; the result holds a frozen Slots, so it is safe to share.
+    Pass `lowered` if the caller already lowercased the query, `today` to pin relative dates.
     """
     text = (query or "").strip()
-    lowered = text.lower()
     if not text:
         return None
+    lowered = lowered.strip() if lowered is not None else text.lower()
+    return _cached_fast_intent_and_slots(text, lowered, fallback_location, (today or date.today()).toordinal())
+
+
+@lru_cache(maxsize=4096)
+def _cached_fast_intent_and_slots(
+    text: str, lowered: str, fallback_location: Optional[str], today_ordinal: int
+) -> Tuple[str, float, Slots] | None:
+    # Keyed on the original-case text: the "in <city>" rule below only fires on a lowercase "in".
+    # `lowered` is derived from text, so it doesn't split the cache; relative dates resolve against the keyed day
+    today = date.fromordinal(today_ordinal)
 
     # Off-topic check first
-    if _is_off_topic(text):
+    if _is_off_topic(text, lowered=lowered):
         return OFF_TOPIC, 0.99, Slots()
 
     # ── Find the city/location ──
     matched_location = None
 
     # 1) Exact match against known cities
-    for city in CITY_GEOIDS:
-        if re.search(rf"\b{re.escape(city.lower())}\b", lowered):
-            matched_location = city
-            break
+    m = _CITY_ALT_RE.search(lowered)
+    if m:
+        matched_location = _CITY_BY_LOWER[m.group(1)]
 
     # 2) Fuzzy match (handles typos like "Colmbo" → "Colombo")
     if not matched_location:
-        matched_location = fuzzy_match_city(text)
+        matched_location = fuzzy_match_city(lowered)
 
-    # 3) "in <city>" pattern
+    # 3) "in <city>" pattern (case-sensitive on purpose, as before: "Hotels In X" is left to the ML path)
     if not matched_location:
         m = re.search(r"\bin\s+([a-zA-Z][a-zA-Z\s]{1,25})", text)
         if m:
@@ -303,28 +437,27 @@ def _try_fast_intent_and_slots(query: str, fallback_location: Optional[str] = No
         return None
 
     # ── Extract dates ──
-    check_in, check_out = _infer_dates_from_text(text)
+    check_in, check_out = _infer_dates_from_text(text, today, lowered=lowered)
 
-    # ── Extract adults / rooms ──
-    adults_m = _ADULTS_RE.search(text)
-    rooms_m = _ROOMS_RE.search(text)
-    adults = int(adults_m.group(1)) if adults_m else None
-    rooms = int(rooms_m.group(1)) if rooms_m else None
+    # ── Extract adults / rooms / price range (first match of each kind wins) ──
+    found: Dict[str, re.Match[str]] = {}
+    if _DIGIT_RE.search(lowered):  # every filter needs a number; most queries have none
+        for m in _FAST_FILTERS_RE.finditer(lowered):
+            found.setdefault(m.lastgroup, m)
+
+    adults = int(found["adults"].group("adults_n")) if "adults" in found else None
+    rooms = int(found["rooms"].group("rooms_n")) if "rooms" in found else None
 
-    # ── Extract price range ──
     price_min, price_max = None, None
-    between_m = _FAST_BETWEEN_PRICE_RE.search(text)
-    if between_m:
-        a, b = _money_to_int(between_m.group(1)), _money_to_int(between_m.group(2))
+    if "between" in found:
+        a, b = _money_to_int(found["between"].group("lo")), _money_to_int(found["between"].group("hi"))
         if a is not None and b is not None:
             price_min, price_max = min(a, b), max(a, b)
     else:
-        under_m = _FAST_UNDER_PRICE_RE.search(text)
-        if under_m:
-            price_max = _money_to_int(under_m.group(1))
-        over_m = _FAST_OVER_PRICE_RE.search(text)
-        if over_m:
-            price_min = _money_to_int(over_m.group(1))
+        if "under" in found:
+            price_max = _money_to_int(found["under"].group("max"))
+        if "over" in found:
+            price_min = _money_to_int(found["over"].group("min"))
 
     # ── Build slots ──
     slots = Slots(
@@ -338,7 +471,7 @@ def _try_fast_intent_and_slots(query: str, fallback_location: Optional[str] = No
     if check_in and check_out:
         return LIVE_PRICES, 0.99, slots
 
-    if _contains_any(lowered, BOOKING_WORDS):
+    if _BOOKING_RE.search(lowered):
         return NEEDS_DATES, 0.95, slots
 
     # Default: local exploration
@@ -349,11 +482,60 @@ def _try_fast_intent_and_slots(query: str, fallback_location: Optional[str] = No
 #  Prompt builders for LLM
 # ═══════════════════════════════════════════════
 
-def _generate_tts_summary(ranked_hotels: List[Dict[str, Any]], user_query: str) -> str:
+# Hotel fields the ranker reads; title duplicates name, provider/source/isSponsored are noise
+_RANK_PROMPT_FIELDS = ("id", "name", "location", "rating", "reviews", "price")
+
+
+def _compact_json(records: List[Dict[str, Any]]) -> str:
+    """Serialize prompt records without whitespace or None-valued fields (fewer prompt tokens)."""
+    compact = [{k: v for k, v in r.items() if v is not None} for r in records]
+    if orjson is not None:
+        return orjson.dumps(compact).decode()
+    return json.dumps(compact, separators=(",", ":"), ensure_ascii=False)
+
+
+def _tabular_json(records: List[Dict[str, Any]], columns: Tuple[str, ...]) -> str:
+    """One JSON array per record in `columns` order: field names are sent once, values keep their JSON types."""
+    dumps = (lambda v: orjson.dumps(v).decode()) if orjson is not None else (
+        lambda v: json.dumps(v, separators=(",", ":"), ensure_ascii=False)
+    )
+    return "\n".join(dumps([r.get(c) for c in columns]) for r in records)
+
+
+def _json_loads(raw: str) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _parse_llm_json(raw: str) -> Any:
+    """Parse a JSON-mode reply; if a provider still wrapped it in a ```json fence, parse the fence body."""
+    try:
+        return _json_loads(raw)
+    except ValueError:  # orjson.JSONDecodeError and json.JSONDecodeError both subclass it
+        fenced = _FENCE_RE.search(raw)
+        if fenced is None:
+            raise
+        return _json_loads(fenced.group(1))
+
+
+async def _generate_tts_summary(ranked_hotels: List[Dict[str, Any]], user_query: str) -> str:
     """Generate a short, voice-optimised TTS narration (separate from the display response)."""
     if not ranked_hotels:
         return "I couldn't find any hotels matching what you're looking for. Try a different location or adjust your preferences."
 
+    try:
+        return await _llm_tts_summary(ranked_hotels, user_query)
+    except Exception as e:
+        logger.warning("TTS summary generation failed: %s", e)
+        return _tts_fallback(ranked_hotels)
+
+
+def _tts_fallback(ranked_hotels: List[Dict[str, Any]]) -> str:
+    top = ranked_hotels[0]
+    return f"I found {len(ranked_hotels)} great options. My top pick is {top.get('name', 'a lovely hotel')}."
+
+
+async def _llm_tts_summary(ranked_hotels: List[Dict[str, Any]], user_query: str) -> str:
+    """LLM narration for a non-empty hotel list; raises if the LLM call fails."""
     compact = [
         {"name": h.get("name", "Unnamed"), "rating": h.get("rating"), "price": h.get("price"), "location": h.get("location")}
         for h in ranked_hotels[:3]
@@ -361,21 +543,63 @@ def _generate_tts_summary(ranked_hotels: List[Dict[str, Any]], user_query: str)
     prompt = f"""You are a friendly voice assistant for a Sri Lanka hotel search app called Scenery.
 The user asked: "{user_query}"
 
-Here are the top picks (JSON): {json.dumps(compact, ensure_ascii=False)}
+Here are the top picks (JSON): {_compact_json(compact)}
 
 Write a SHORT spoken summary (2-3 sentences max). Highlight the number-one pick by name and its best selling point.
 Mention the other picks only briefly. Use a warm, conversational tone suitable for text-to-speech.
 Do NOT use markdown, bullet points, or emojis. Output only the final spoken text."""
 
-    try:
-        return (generate_text(prompt, max_output_tokens=120, temperature=0.6) or "").strip()
-    except Exception as e:
-        logger.warning("TTS summary generation failed: %s", e)
-        top = ranked_hotels[0]
-        return f"I found {len(ranked_hotels)} great options. My top pick is {top.get('name', 'a lovely hotel')}."
+    return (await agenerate_text(prompt, max_output_tokens=120, temperature=0.6) or "").strip()
+
+
+# ── LLM ranking cache ──
+# NOTE: per-process, same (ts, value) TTL approach as the local-DB result cache.
+# Keyed on everything the prompt depends on, so a live price change is a cache miss.
+# Only the LLM's output is stored (ranked ids, response, voice summary); hotel dicts are
+# rebuilt from each caller's own list, so nothing mutable is shared between responses.
+_RANK_CACHE: Dict[bytes, Tuple[float, Tuple[Tuple[Any, ...], str, Optional[str]]]] = {}
+RANK_CACHE_TTL_SECONDS = 10 * 60  # 10 minutes
+RANK_CACHE_MAX_ENTRIES = 2048
+
+
+def _rank_cache_key(mode: str, limit: int, user_query: str, hotels_json: str) -> bytes:
+    normalized = " ".join(user_query.lower().split())
+    return hashlib.blake2b(f"{mode}|{limit}|{normalized}|{hotels_json}".encode(), digest_size=16).digest()
+
+
+def _get_cached_ranking(key: bytes) -> Optional[Tuple[Tuple[Any, ...], str, Optional[str]]]:
+    entry = _RANK_CACHE.get(key)
+    if not entry:
+        return None
+
+    ts, ranking = entry
+    if time.time() - ts > RANK_CACHE_TTL_SECONDS:
+        _RANK_CACHE.pop(key, None)
+        return None
 
+    return ranking
 
-def _rank_and_respond(hotels: List[Dict[str, Any]], user_query: str, mode: str = "text", limit: int = 5) -> Dict[str, Any]:
+
+def _set_cached_ranking(
+    key: bytes, ranked_ids: List[Any], llm_response: str, tts_response: Optional[str]
+) -> None:
+    if len(_RANK_CACHE) >= RANK_CACHE_MAX_ENTRIES:
+        _RANK_CACHE.pop(next(iter(_RANK_CACHE)), None)  # drop the oldest insert
+    _RANK_CACHE[key] = (time.time(), (tuple(ranked_ids), llm_response, tts_response))
+
+
+def _order_by_ranking(hotels: List[Dict[str, Any]], ranked_ids, limit: int) -> List[Dict[str, Any]]:
+    """Hotels in LLM-ranked order (index only the hotels the LLM picked), padded with unranked ones up to limit."""
+    ranked_set = set(ranked_ids)
+    id_map = {hid: h for h in hotels if (hid := h.get("id")) in ranked_set}
+    ranked_hotels = [id_map[hid] for hid in ranked_ids if hid in id_map][:limit]
+
+    if len(ranked_hotels) < limit:
+        ranked_hotels += [h for h in hotels[:limit] if h.get("id") not in ranked_set][: limit - len(ranked_hotels)]
+    return ranked_hotels
+
+
+async def _rank_and_respond(hotels: List[Dict[str, Any]], user_query: str, mode: str = "text", limit: int = 5) -> Dict[str, Any]:
     """Use LLM to rank hotels and write a natural response."""
     # Voice mode: limit to 3 hotels for concise output
     if mode == "voice" and limit == 5:
@@ -388,7 +612,17 @@ def _rank_and_respond(hotels: List[Dict[str, Any]], user_query: str, mode: str =
             out["tts_response"] = "I couldn't find any hotels matching what you're looking for. Try a different location or adjust your preferences."
         return out
 
-    hotels_subset = hotels[:15]
+    hotels_json = _tabular_json(hotels[:15], _RANK_PROMPT_FIELDS)
+
+    # Identical query + hotel list (reload, "show me again") reuses the earlier ranking
+    cache_key = _rank_cache_key(mode, limit, user_query, hotels_json)
+    cached = _get_cached_ranking(cache_key)
+    if cached is not None:
+        ranked_ids, llm_response, tts_response = cached
+        out = {"ranked_hotels": _order_by_ranking(hotels, ranked_ids, limit), "llm_response": llm_response, "mode": mode}
+        if tts_response is not None:
+            out["tts_response"] = tts_response
+        return out
 
     tone = (
         "Reply in a natural conversational tone. Use short sentences. No markdown or emojis."
@@ -400,8 +634,8 @@ def _rank_and_respond(hotels: List[Dict[str, Any]], user_query: str, mode: str =
 
 User Query: "{user_query}"
 
-Hotels available (JSON):
-{json.dumps(hotels_subset, indent=2)}
+Hotels available (one JSON array per hotel; columns: {", ".join(_RANK_PROMPT_FIELDS)}):
+{hotels_json}
 
 Task:
 1. Carefully analyze the user's query for contextual clues:
@@ -423,38 +657,26 @@ Task:
 Output only valid JSON, no extra text."""
 
     try:
-        raw = generate_text(prompt).strip()
-        # Strip ```json wrapper if present
-        if raw.startswith("```json"):
-            raw = raw[7:]
-        if raw.startswith("```"):
-            raw = raw[3:]
-        if raw.endswith("```"):
-            raw = raw[:-3]
-
-        result = json.loads(raw.strip())
+        result = _parse_llm_json(await agenerate_text(prompt, json_output=True))
         ranked_ids = result.get("ranked_ids", [])
         llm_response = result.get("response", "")
 
-        # Reorder hotels by LLM ranking
-        id_map = {h.get("id"): h for h in hotels}
-        ranked_hotels = [id_map[hid] for hid in ranked_ids if hid in id_map]
-
-        # Pad with unranked hotels if needed
-        ranked_set = set(ranked_ids)
-        for h in hotels[:limit]:
-            if h.get("id") not in ranked_set:
-                ranked_hotels.append(h)
-            if len(ranked_hotels) >= limit:
-                break
-
-        ranked_hotels = ranked_hotels[:limit]
+        ranked_hotels = _order_by_ranking(hotels, ranked_ids, limit)
         out = {"ranked_hotels": ranked_hotels, "llm_response": llm_response, "mode": mode}
 
         # Generate a separate voice-optimised TTS summary
+        tts_response = None
         if mode == "voice":
-            out["tts_response"] = _generate_tts_summary(ranked_hotels, user_query)
-
+            try:
+                tts_response = await _llm_tts_summary(ranked_hotels, user_query)
+            except Exception as e:
+                # Serve the canned line this once, but don't pin it in the cache
+                logger.warning("TTS summary generation failed: %s", e)
+                out["tts_response"] = _tts_fallback(ranked_hotels)
+                return out
+            out["tts_response"] = tts_response
+
+        _set_cached_ranking(cache_key, ranked_ids, llm_response, tts_response)
         return out
 
     except Exception as e:
@@ -462,11 +684,11 @@ Output only valid JSON, no extra text."""
         fallback_hotels = hotels[:limit]
         out = {"ranked_hotels": fallback_hotels, "llm_response": f"Here are {len(hotels)} hotels matching your search.", "mode": mode}
         if mode == "voice":
-            out["tts_response"] = _generate_tts_summary(fallback_hotels, user_query)
+            out["tts_response"] = await _generate_tts_summary(fallback_hotels, user_query)
         return out
 
 
-def _generate_local_llm_response(hotels: List[Dict[str, Any]], location: str, user_query: str, mode: str) -> str:
+async def _generate_local_llm_response(hotels: List[Dict[str, Any]], location: str, user_query: str, mode: str) -> str:
     """Generate a short LLM summary for local DB results."""
     compact = [
         {"name": h.get("name", "Unnamed"), "rating": h.get("rating"), "price": h.get("price"), "location": h.get("location") or location}
@@ -482,11 +704,11 @@ def _generate_local_llm_response(hotels: List[Dict[str, Any]], location: str, us
 
 User query: {user_query}
 Location: {location}
-Hotel options: {json.dumps(compact, ensure_ascii=False)}
+Hotel options: {_compact_json(compact)}
 
 Write only the final response text for the user."""
 
-    output = generate_text(prompt, max_output_tokens=90, temperature=0.5)
+    output = await agenerate_text(prompt, max_output_tokens=90, temperature=0.5)
     return (output or "").strip()
 
 
@@ -494,20 +716,123 @@ Write only the final response text for the user."""
 #  Prompt helpers (ask user for missing info)
 # ═══════════════════════════════════════════════
 
-def _ask_location(intent: str, confidence: float, slots, extra_msg: str = "") -> Dict[str, Any]:
+def _ask_location(intent: str, confidence: float, slots_out: Dict[str, Any], extra_msg: str = "") -> Dict[str, Any]:
     msg = "Which city/area are you looking for? (e.g. : 'Mirissa', 'Colombo', 'Galle')"
     if extra_msg:
         msg = extra_msg.strip() + " " + msg
     return {
         "intent": intent, "confidence": confidence, "action": "ASK_LOCATION",
-        "message": msg, "slots": asdict(slots), "choices": list(CITY_GEOIDS.keys()),
+        "message": msg, "slots": slots_out, "choices": _CITY_CHOICES,
     }
 
 
-def _ask_dates(intent: str, confidence: float, slots, needs_location_too: bool) -> Dict[str, Any]:
+def _ask_dates(intent: str, confidence: float, slots_out: Dict[str, Any], needs_location_too: bool) -> Dict[str, Any]:
     msg = "Tell me the city/area AND your check-in + check-out dates." if needs_location_too \
         else "What are your check-in and check-out dates?"
-    return {"intent": intent, "confidence": confidence, "action": "ASK_DATES", "message": msg, "slots": asdict(slots)}
+    return {"intent": intent, "confidence": confidence, "action": "ASK_DATES", "message": msg, "slots": slots_out}
+
+
+# ═══════════════════════════════════════════════
+#  Intent handlers
+# ═══════════════════════════════════════════════
+# Each handler gets the shared base response {"intent", "confidence", "slots"} and merges its own keys in.
+
+async def _handle_off_topic(base: Dict[str, Any], slots: Slots, user_query: str, mode: str) -> Dict[str, Any]:
+    if _GREETING_RE.search(user_query):
+        msg = (
+            "Hello! I'm Scenery, your Sri Lanka hotel assistant. "
+            "Ask me things like 'Hotels in Colombo' or 'Luxury stays in Ella under 30000 LKR'. "
+            "How can I help?"
+        )
+    elif _FAREWELL_RE.search(user_query):
+        msg = "Goodbye! Have a wonderful trip. Come back anytime you need hotel help."
+    else:
+        msg = (
+            "I'm specialised in Sri Lanka hotel search. "
+            "Try asking something like 'Hotels in Kandy' or 'Best places to stay in Mirissa under 20000 LKR'."
+        )
+    return base | {"action": "FALLBACK", "message": msg}
+
+
+async def _handle_explore_local(base: Dict[str, Any], slots: Slots, user_query: str, mode: str) -> Dict[str, Any]:
+    """Local exploration (SQLite)."""
+    if not slots.location:
+        return _ask_location(base["intent"], base["confidence"], base["slots"])
+
+    # SQLite is blocking; run it off the event loop so concurrent requests keep being served
+    data = await asyncio.to_thread(
+        get_hotel_insights_localdb,
+        location=slots.location,
+        user_request=user_query,
+        rating=None,
+        priceMin=slots.price_min,
+        priceMax=slots.price_max,
+    )
+    results = data.get("results", [])
+
+    # Use LLM to rank hotels by user preferences (same as LIVE_PRICES mode)
+    ranking = await _rank_and_respond(results, user_query, mode)
+    data["ranking"] = ranking
+
+    return base | {"action": "LOCAL_DB", "data": data}
+
+
+async def _handle_needs_dates(base: Dict[str, Any], slots: Slots, user_query: str, mode: str) -> Dict[str, Any]:
+    return _ask_dates(base["intent"], base["confidence"], base["slots"], needs_location_too=not slots.location)
+
+
+async def _handle_live_prices(base: Dict[str, Any], slots: Slots, user_query: str, mode: str) -> Dict[str, Any]:
+    """Live prices (RapidAPI)."""
+    confidence, slots_out = base["confidence"], base["slots"]
+    if not (slots.check_in and slots.check_out):
+        return _ask_dates(NEEDS_DATES, confidence, slots_out, needs_location_too=not slots.location)
+
+    if not slots.location:
+        return _ask_location(NEEDS_DATES, confidence, slots_out, extra_msg="To check live prices,")
+
+    geo = convert_geo_id(slots.location)
+    if not geo.geo_id:
+        return _ask_location(NEEDS_DATES, confidence, slots_out, extra_msg=f"I couldn't map '{slots.location}' to a supported city.")
+
+    base = base | {"geo": {"geoId": geo.geo_id, "city": geo.matched_city}}
+    try:
+        data = await get_hotel_insights(
+            geoId=str(geo.geo_id),
+            checkIn=slots_out["check_in"],
+            checkOut=slots_out["check_out"],
+            adults=slots.adults or 2,
+            rooms=slots.rooms or 1,
+            priceMin=slots.price_min,
+            priceMax=slots.price_max,
+            rating=None,
+            user_request=user_query,
+        )
+        hotels_list = data.get("results", [])
+        ranking = await _rank_and_respond(hotels_list, user_query, mode)
+        data["ranking"] = ranking
+
+        return base | {"action": "RAPIDAPI", "data": data}
+    except Exception as e:
+        logger.warning("RapidAPI error: %s", e)
+        return base | {
+            "action": "RAPIDAPI_ERROR",
+            "message": f"Sorry, I couldn't fetch live prices right now. Error: {e}",
+        }
+
+
+async def _handle_fallback(base: Dict[str, Any], slots: Slots, user_query: str, mode: str) -> Dict[str, Any]:
+    return base | {
+        "action": "FALLBACK",
+        "message": "I'm not sure what you're looking for. Try something like 'Hotels in Galle' or 'Luxury stays in Colombo'.",
+    }
+
+
+_INTENT_HANDLERS = {
+    OFF_TOPIC: _handle_off_topic,
+    EXPLORE_LOCAL: _handle_explore_local,
+    NEEDS_DATES: _handle_needs_dates,
+    LIVE_PRICES: _handle_live_prices,
+}
 
 
 # ═══════════════════════════════════════════════
@@ -531,7 +856,7 @@ async def handle_query(
     """
     # Re-ranking mode: Just re-rank existing hotels without calling RapidAPI
     if rerank_hotels and isinstance(rerank_hotels, list) and len(rerank_hotels) > 0:
-        ranking = await asyncio.to_thread(_rank_and_respond, rerank_hotels, user_query, mode)
+        ranking = await _rank_and_respond(rerank_hotels, user_query, mode)
         return {
             "intent": "LIVE_PRICES", "confidence": 1.0, "action": "RERANK",
             "slots": {"location": preset_location or ""} if preset_location else {},
@@ -552,23 +877,24 @@ async def handle_query(
             }
         
         # Extract preferences from query
-        extracted = extract_slots(user_query)
+        extracted = await _aextract_slots(user_query)
         slots = Slots(
             location=location,
             check_in=check_in,
             check_out=check_out,
-            price_min=getattr(extracted, "price_min", None),
-            price_max=getattr(extracted, "price_max", None),
-            adults=getattr(extracted, "adults", None) or 2,
-            rooms=getattr(extracted, "rooms", None) or 1,
+            price_min=extracted.price_min,
+            price_max=extracted.price_max,
+            adults=extracted.adults or 2,
+            rooms=extracted.rooms or 1,
         )
+        slots_out = slots.to_dict()
         
         geo = convert_geo_id(location)
         if not geo.geo_id:
             return {
                 "intent": "LIVE_PRICES", "confidence": 1.0, "action": "FALLBACK",
                 "message": f"Sorry, I couldn't map '{location}' to a supported city.",
-                "slots": asdict(slots)
+                "slots": slots_out
             }
         
         try:
@@ -584,12 +910,12 @@ async def handle_query(
                 user_request=user_query,
             )
             hotels_list = data.get("results", [])
-            ranking = await asyncio.to_thread(_rank_and_respond, hotels_list, user_query, mode)
+            ranking = await _rank_and_respond(hotels_list, user_query, mode)
             data["ranking"] = ranking
             
             return {
                 "intent": "LIVE_PRICES", "confidence": 1.0, "action": "RAPIDAPI",
-                "slots": asdict(slots),
+                "slots": slots_out,
                 "geo": {"geoId": geo.geo_id, "city": geo.matched_city},
                 "data": data,
             }
@@ -598,123 +924,49 @@ async def handle_query(
             return {
                 "intent": "LIVE_PRICES", "confidence": 1.0, "action": "RAPIDAPI_ERROR",
                 "message": f"Sorry, I couldn't fetch live prices right now. Error: {e}",
-                "slots": asdict(slots),
+                "slots": slots_out,
             }
     
     context_slots = context.get("slots") if isinstance(context, dict) else None
-    context_location = None
-    if isinstance(context_slots, dict) and context_slots.get("location"):
-        context_location = str(context_slots["location"]).strip() or None
+    context_parsed = _parse_context_slots(context_slots) if isinstance(context_slots, dict) else None
+    context_location = context_parsed.location if context_parsed else None
+
+    q_lower = user_query.lower()
+    if not q_lower.strip():
+        # Nothing to classify: answer without running the regex stack, the intent model or spaCy
+        # (slots from earlier turns are carried over so the session memory isn't wiped)
+        slots = context_parsed if context_parsed is not None else Slots()
+        base = {"intent": OFF_TOPIC, "confidence": 0.99, "slots": slots.to_dict()}
+        return await _handle_off_topic(base, slots, user_query, mode)
+
+    today = date.today()  # one clock read per turn; keys the per-day slot caches below
 
     # ── Step 1: Try fast regex-based classification ──
-    fast = _try_fast_intent_and_slots(user_query, fallback_location=context_location)
+    fast = _try_fast_intent_and_slots(user_query, fallback_location=context_location, lowered=q_lower, today=today)
 
     if fast:
         intent, confidence, slots = fast
     else:
-        # Fall back to ML model + spaCy slot extraction
-        intent, confidence = predict_intent(user_query)
-        slots = extract_slots(user_query)
-        intent = _apply_overrides(intent, user_query, slots)
+        # Fall back to ML model + spaCy slot extraction, run concurrently (spaCy works on its own thread
+        # while the intent batcher collects); the batcher normalizes its own cache key
+        (intent, confidence), slots = await asyncio.gather(
+            batched_predict_intent(q_lower),
+            _aextract_slots(user_query, today),
+        )
+        intent = _apply_overrides(intent, q_lower, slots)
 
     # ── Step 2: Merge in context from previous turns ──
-    if isinstance(context_slots, dict):
-        _apply_context_slots(slots, context_slots)
-        intent = _apply_overrides(intent, user_query, slots)
+    if context_parsed is not None:
+        slots = _apply_context_slots(slots, context_parsed)
+        intent = _apply_overrides(intent, q_lower, slots)
 
     # Mode override: Standard mode never uses RapidAPI
     if force_mode == "standard" and intent == LIVE_PRICES:
         intent = EXPLORE_LOCAL
 
-    # ── Step 3: Route by intent ──
-
-    # 0) Off-topic
-    if intent == OFF_TOPIC:
-        if _GREETING_RE.search(user_query):
-            msg = (
-                "Hello! I'm Scenery, your Sri Lanka hotel assistant. "
-                "Ask me things like 'Hotels in Colombo' or 'Luxury stays in Ella under 30000 LKR'. "
-                "How can I help?"
-            )
-        elif _FAREWELL_RE.search(user_query):
-            msg = "Goodbye! Have a wonderful trip. Come back anytime you need hotel help."
-        else:
-            msg = (
-                "I'm specialised in Sri Lanka hotel search. "
-                "Try asking something like 'Hotels in Kandy' or 'Best places to stay in Mirissa under 20000 LKR'."
-            )
-        return {"intent": OFF_TOPIC, "confidence": confidence, "action": "FALLBACK", "message": msg, "slots": asdict(slots)}
-
-    # 1) Local exploration (SQLite)
-    if intent == EXPLORE_LOCAL:
-        if not getattr(slots, "location", None):
-            return _ask_location(intent, confidence, slots)
-
-        data = get_hotel_insights_localdb(
-            location=slots.location,
-            user_request=user_query,
-            rating=None,
-            priceMin=getattr(slots, "price_min", None),
-            priceMax=getattr(slots, "price_max", None),
-        )
-        results = data.get("results", [])
-
-        # Use LLM to rank hotels by user preferences (same as LIVE_PRICES mode)
-        ranking = await asyncio.to_thread(_rank_and_respond, results, user_query, mode)
-        data["ranking"] = ranking
-
-        return {"intent": intent, "confidence": confidence, "action": "LOCAL_DB", "slots": asdict(slots), "data": data}
-
-    # 2) Needs dates
-    if intent == NEEDS_DATES:
-        return _ask_dates(intent, confidence, slots, needs_location_too=not bool(getattr(slots, "location", None)))
-
-    # 3) Live prices (RapidAPI)
-    if intent == LIVE_PRICES:
-        if not (getattr(slots, "check_in", None) and getattr(slots, "check_out", None)):
-            return _ask_dates(NEEDS_DATES, confidence, slots, needs_location_too=not bool(getattr(slots, "location", None)))
+    slots_out = slots.to_dict()
 
-        if not getattr(slots, "location", None):
-            return _ask_location(NEEDS_DATES, confidence, slots, extra_msg="To check live prices,")
-
-        geo = convert_geo_id(slots.location)
-        if not geo.geo_id:
-            return _ask_location(NEEDS_DATES, confidence, slots, extra_msg=f"I couldn't map '{slots.location}' to a supported city.")
-
-        try:
-            data = await get_hotel_insights(
-                geoId=str(geo.geo_id),
-                checkIn=slots.check_in,
-                checkOut=slots.check_out,
-                adults=getattr(slots, "adults", None) or 2,
-                rooms=getattr(slots, "rooms", None) or 1,
-                priceMin=getattr(slots, "price_min", None),
-                priceMax=getattr(slots, "price_max", None),
-                rating=None,
-                user_request=user_query,
-            )
-            hotels_list = data.get("results", [])
-            ranking = await asyncio.to_thread(_rank_and_respond, hotels_list, user_query, mode)
-            data["ranking"] = ranking
-
-            return {
-                "intent": intent, "confidence": confidence, "action": "RAPIDAPI",
-                "slots": asdict(slots),
-                "geo": {"geoId": geo.geo_id, "city": geo.matched_city},
-                "data": data,
-            }
-        except Exception as e:
-            logger.warning("RapidAPI error: %s", e)
-            return {
-                "intent": intent, "confidence": confidence, "action": "RAPIDAPI_ERROR",
-                "slots": asdict(slots),
-                "geo": {"geoId": geo.geo_id, "city": geo.matched_city},
-                "message": f"Sorry, I couldn't fetch live prices right now. Error: {e}",
-            }
-
-    # 4) Fallback
-    return {
-        "intent": intent, "confidence": confidence, "action": "FALLBACK",
-        "message": "I'm not sure what you're looking for. Try something like 'Hotels in Galle' or 'Luxury stays in Colombo'.",
-        "slots": asdict(slots),
-    }
\ No newline at end of file
+    # ── Step 3: Route by intent ──
+    handler = _INTENT_HANDLERS.get(intent, _handle_fallback)
+    base = {"intent": intent, "confidence": confidence, "slots": slots_out}
+    return await handler(base, slots, user_query, mode)
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import warnings
 from pathlib import Path
 from fastapi import FastAPI
@@ -5,9 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from backend.routers import health, rapidapi_insights, localdb_insights, voice, chat, voice_room
+from backend.ml.query_router import predict_intent
+from backend.services.keyword_extractor import extract_slots
 
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
+logger = logging.getLogger(__name__)
+
 
 # signore pydantic warnings about field names that match BaseModel attributes by google genai library
 warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent")
@@ -30,6 +36,16 @@ app.include_router(voice.router)
 app.include_router(voice_room.router)
 app.include_router(chat.router)
 
+
+@app.on_event("startup")
+async def warm_up_models():
+    # Load the intent model and the spaCy pipeline at boot so the first chat turn doesn't pay for it
+    for name, warm in (("intent model", predict_intent), ("spaCy slot extractor", extract_slots)):
+        try:
+            await asyncio.to_thread(warm, "hotels in colombo")
+        except Exception as e:
+            logger.warning("Warm-up of %s failed (%s); it will load on first use", name, e)
+
 # Serve the frontend so pages open from http://localhost:8000/voice.html etc.
 # This must come LAST — all API routers are registered above.
 # file:// never persists mic permissions; localhost does.
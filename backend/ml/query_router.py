@@ -3,34 +3,46 @@ Load the TF-IDF model trained on the query dataset and use it to predict the int
 """
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import List, Sequence, Tuple
 
 import joblib
 
 MODEL_PATH = Path(__file__).with_name("model_query_tfidf.joblib")
 
 _model = None
+_model_lock = threading.Lock()  # startup warm-up and batch worker threads may race; load only once
 
 
 def _get_model():
     global _model
     if _model is None:
-        if not MODEL_PATH.exists():
-            raise FileNotFoundError(
-                f"TF-IDF model not found at {MODEL_PATH}. Train it first (train_query_tfidf.py)."
-            )
-        _model = joblib.load(MODEL_PATH)
+        with _model_lock:
+            if _model is None:
+                if not MODEL_PATH.exists():
+                    raise FileNotFoundError(
+                        f"TF-IDF model not found at {MODEL_PATH}. Train it first (train_query_tfidf.py)."
+                    )
+                _model = joblib.load(MODEL_PATH)
     return _model
 
 
+def predict_intents(texts: Sequence[str]) -> List[Tuple[str, float]]:
+    """
+    Batched predict_intent: one vectorize + predict_proba call for all texts.
+    Returns [(predicted_label, confidence), ...] in input order.
+    """
+    model = _get_model()
+    results = []
+    for proba in model.predict_proba(list(texts)):
+        idx = int(proba.argmax())
+        results.append((str(model.classes_[idx]), float(proba[idx])))
+    return results
+
+
 def predict_intent(text: str) -> Tuple[str, float]:
     """
     Returns (predicted_label, confidence).
     """
-    model = _get_model()
-    proba = model.predict_proba([text])[0]
-    idx = int(proba.argmax())
-    label = str(model.classes_[idx])
-    conf = float(proba[idx])
-    return label, conf
+    return predict_intents([text])[0]
@@ -0,0 +1,86 @@
+"""
+Micro-batch intent predictions from concurrent requests into a single TF-IDF predict_proba call.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from backend.ml.query_router import predict_intents
+
+
+class IntentBatcher:
+    """
+    Collects queries that arrive within `max_wait` seconds (up to `max_batch`) and classifies
+    them together off the event loop. Recent results are kept in a small LRU so repeated
+    queries resolve without touching the model.
+    """
+
+    def __init__(self, max_batch: int = 32, max_wait: float = 0.01, cache_size: int = 4096):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return loop
+
+    async def predict(self, text: str) -> Tuple[str, float]:
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        loop = self._ensure_worker()
+        fut = loop.create_future()
+        self._queue.put_nowait((text, fut))
+        return await fut
+
+    def _remember(self, text: str, result: Tuple[str, float]) -> None:
+        self._cache[text] = result
+        self._cache.move_to_end(text)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await queue.get()]
+            if self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)  # coalescing window
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            texts = list(dict.fromkeys(text for text, _ in batch))  # dedupe, keep order
+            try:
+                results = dict(zip(texts, await asyncio.to_thread(predict_intents, texts)))
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            for text, result in results.items():
+                self._remember(text, result)
+            for text, fut in batch:
+                if not fut.done():  # the caller may have been cancelled
+                    fut.set_result(results[text])
+
+
+_batcher = IntentBatcher()
+
+
+async def batched_predict_intent(text: str) -> Tuple[str, float]:
+    """Async predict_intent that shares a predict_proba call with concurrent requests."""
+    # The char_wb TF-IDF lowercases and collapses whitespace itself, so this key changes
+    # nothing for the model but lets "Hotels  in Kandy " reuse the cached "hotels in kandy"
+    return await _batcher.predict(" ".join(text.lower().split()))
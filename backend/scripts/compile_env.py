@@ -0,0 +1,35 @@
+"""
+Compile backend/.env into backend/_env_compiled.py so deployed processes import plain constants
+(cached as .pyc) instead of parsing the .env file on every start. Only used when ENV is set to a
+deployed environment (e.g. production); development/test always read backend/.env. Run during the image build:
+
+    python -m backend.scripts.compile_env
+"""
+from __future__ import annotations
+
+import pprint
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+ENV_PATH = BACKEND_DIR / ".env"
+OUT_PATH = BACKEND_DIR / "_env_compiled.py"
+
+
+def main():
+    if not ENV_PATH.exists():
+        raise FileNotFoundError(f".env not found: {ENV_PATH}")
+
+    values = {k: v for k, v in dotenv_values(ENV_PATH).items() if v is not None} # skip bare keys without "="
+    OUT_PATH.write_text(
+        "# Generated by backend/scripts/compile_env.py from backend/.env. Do not edit or commit.\n"
+        f"ENV_VALUES = {pprint.pformat(values)}\n",
+        encoding="utf-8",
+    )
+
+    print(f"✅ Compiled {len(values)} variables to: {OUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
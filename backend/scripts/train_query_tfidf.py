@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 import joblib
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
@@ -45,6 +46,14 @@ def main():
     )
 
     model.fit(X, y)
+
+    # Serve in float32: half the bytes per predict_proba (TF-IDF rows and the dense coef_ matrix);
+    # training itself stays float64 (lbfgs upcasts anyway)
+    model.named_steps["tfidf"].set_params(dtype=np.float32)
+    clf = model.named_steps["clf"]
+    clf.coef_ = clf.coef_.astype(np.float32)
+    clf.intercept_ = clf.intercept_.astype(np.float32)
+
     MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(model, MODEL_PATH)
 
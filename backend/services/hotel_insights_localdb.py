@@ -6,8 +6,11 @@ from __future__ import annotations
 import json
 import re
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "hotels.db"
@@ -16,6 +19,39 @@ _PRICE_RE = re.compile(r"(\d[\d,]*)")
 _LUXURY_HINT_RE = re.compile(r"\b(luxury|premium|upscale|high[-\s]?end|5[-\s]?star|five[-\s]?star)\b", re.IGNORECASE)
 _FAMILY_HINT_RE = re.compile(r"\b(family[-\s]?friendly|family|kids?|children|child)\b", re.IGNORECASE)
 
+# ----------------------------
+# Simple in-memory result cache
+# ----------------------------
+# NOTE: per-process, same approach as the RapidAPI cache in hotel_raw_json.py.
+# Local hotel data changes rarely, so identical searches reuse the ranked list for a while.
+_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()  # lookups run in asyncio.to_thread workers
+CACHE_TTL_SECONDS = 5 * 60  # 5 minutes
+CACHE_MAX_ENTRIES = 1024  # keys include free-text locations and prices, so bound the dict
+
+
+def _get_cached(key: Tuple[Any, ...]) -> Optional[List[Dict[str, Any]]]:
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if not entry:
+            return None
+
+        ts, hotels = entry
+        if time.time() - ts > CACHE_TTL_SECONDS:
+            del _CACHE[key]  # expired
+            return None
+
+        _CACHE.move_to_end(key)
+        return hotels
+
+
+def _set_cache(key: Tuple[Any, ...], hotels: List[Dict[str, Any]]) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.time(), hotels)
+        _CACHE.move_to_end(key)
+        if len(_CACHE) > CACHE_MAX_ENTRIES:
+            _CACHE.popitem(last=False)  # least recently used
+
 
 # DB helpers
 def _open_conn() -> sqlite3.Connection:
@@ -88,6 +124,17 @@ def serialize_hotel(row: sqlite3.Row) -> Dict[str, Any]:
         "source": "local_db",
     }
 
+def _wrap_results(hotels: List[Dict[str, Any]], location: str, user_request: str) -> Dict[str, Any]:
+    return {
+        "source": "local_db",
+        "user_request": user_request,
+        "count": len(hotels),
+        "results": hotels,
+        "meta": {
+            "location": location,
+        },
+    }
+
 # * -> search_hotels(geoID=...,) not searchHotels(...,)
 # db param kept for future extensibility if we want to swap out SQLite for something else
 def get_hotel_insights_localdb(
@@ -99,6 +146,16 @@ def get_hotel_insights_localdb(
     priceMin: Optional[int] = None,
     priceMax: Optional[int] = None,
 ) -> Dict[str, Any]:
+    # The user request only affects ranking through the luxury/family hints, so key on those
+    request = user_request or ""
+    cache_key = (
+        location.lower(), limit, rating, priceMin, priceMax,
+        bool(_LUXURY_HINT_RE.search(request)), bool(_FAMILY_HINT_RE.search(request)),
+    )
+    cached = _get_cached(cache_key)
+    if cached is not None:
+        return _wrap_results(list(cached), location, user_request)
+
     # Same retrieval/filter logic, wrapped with metadata for decision engine
     filters = ["active = 1", "LOWER(city) LIKE LOWER(?)"]
     params: List[Any] = [f"%{location}%"]
@@ -144,13 +201,6 @@ def get_hotel_insights_localdb(
 
         ranked_hotels.sort(key=lambda x: (x[0], x[1], x[2]), reverse=True)
         hotels = [item[3] for item in ranked_hotels[:limit]]
+        _set_cache(cache_key, list(hotels))
 
-    return {
-        "source": "local_db",
-        "user_request": user_request,
-        "count": len(hotels),
-        "results": hotels,
-        "meta": {
-            "location": location,
-        },
-    }
+    return _wrap_results(hotels, location, user_request)
@@ -8,16 +8,17 @@ This module contains logic to extract information from user queries.
 from __future__ import annotations
 
 import re
+import threading
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import spacy
 from rapidfuzz import fuzz
 from dateparser.search import search_dates
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Slots:
     location: Optional[str] = None
     check_in: Optional[date] = None
@@ -27,6 +28,19 @@ class Slots:
     price_min: Optional[int] = None
     price_max: Optional[int] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat response dict with dates as ISO strings (dataclasses.asdict deep-copies every field)."""
+        check_in, check_out = self.check_in, self.check_out
+        return {
+            "location": self.location,
+            "check_in": check_in.isoformat() if isinstance(check_in, date) else check_in,
+            "check_out": check_out.isoformat() if isinstance(check_out, date) else check_out,
+            "adults": self.adults,
+            "rooms": self.rooms,
+            "price_min": self.price_min,
+            "price_max": self.price_max,
+        }
+
 
 # Must stay in sync with CITY_GEOIDS in location_geoid_converter.py and hotels.db
 SUPPORTED_LOCATIONS = [
@@ -47,12 +61,15 @@ _UNDER_RE   = re.compile(r"(under|below|less than|up to)\s+([^\s]+)", re.IGNOREC
 _ABOVE_RE   = re.compile(r"(above|more than|over|at least)\s+([^\s]+)", re.IGNORECASE)
 
 _nlp = None
+_nlp_lock = threading.Lock()  # extract_slots runs in worker threads; load the model only once
 
 
 def _get_nlp():
     global _nlp
     if _nlp is None:
-        _nlp = spacy.load("en_core_web_sm")  # english core web trained small model
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = spacy.load("en_core_web_sm")  # english core web trained small model
     return _nlp
 
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional
 
 
@@ -25,7 +26,7 @@ CITY_GEOIDS: Dict[str, int] = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class GeoResolveResult:
     geo_id: Optional[int]
     matched_city: str
@@ -42,11 +43,20 @@ def _normalize(text: str) -> str:
     return t.lower()
 
 
+# (canonical, normalized) pairs, so geo/fuzzy matching doesn't re-normalize every city per query
+_NORMALIZED_CITIES = tuple((city, _normalize(city)) for city in CITY_GEOIDS)
+
+
 def convert_geo_id(location: str) -> GeoResolveResult:
     """
     Convert user location string -> geoId.
     """
-    raw = (location or "").strip()
+    return _convert_geo_id_cached((location or "").strip())
+
+
+@lru_cache(maxsize=256)
+def _convert_geo_id_cached(raw: str) -> GeoResolveResult:
+    # GeoResolveResult is frozen, so cached results are shared safely
     if not raw:
         return GeoResolveResult(None, "", "unknown")
 
@@ -57,14 +67,14 @@ def convert_geo_id(location: str) -> GeoResolveResult:
     norm = _normalize(raw)
 
     # exact match against keys
-    for city, gid in CITY_GEOIDS.items():
-        if _normalize(city) == norm:
-            return GeoResolveResult(gid, city, "map")
+    for city, norm_city in _NORMALIZED_CITIES:
+        if norm_city == norm:
+            return GeoResolveResult(CITY_GEOIDS[city], city, "map")
 
     # city appears inside phrase (not used but added for robustness)
-    for city, gid in CITY_GEOIDS.items():
-        if _normalize(city) in norm:
-            return GeoResolveResult(gid, city, "map")
+    for city, norm_city in _NORMALIZED_CITIES:
+        if norm_city in norm:
+            return GeoResolveResult(CITY_GEOIDS[city], city, "map")
 
     return GeoResolveResult(None, raw, "Could not find a matching geoid for location")
 
@@ -91,8 +101,8 @@ def fuzzy_match_city(text: str, threshold: int = 72) -> Optional[str]:
     best_score = 0
     best_city: Optional[str] = None
 
-    for city in CITY_GEOIDS:
-        score = _fuzz.token_set_ratio(query, _normalize(city))
+    for city, norm_city in _NORMALIZED_CITIES:
+        score = _fuzz.token_set_ratio(query, norm_city)
         if score > best_score:
             best_score = score
             best_city = city